@@ -1,53 +1,51 @@
-from playwright.sync_api import sync_playwright
+import csv
+import os
+import sys
+from email.utils import formatdate
 from pathlib import Path
 
-""" -------Clean Tickers Directory-------"""
-directory = Path('/Users/arnarfreyrerlingsson/Desktop/Trading/Data/tickers')
+import requests
 
-# Clean existing files
-for file in directory.iterdir():
-    file.unlink()
+""" -------Tickers Directory-------"""
+directory = Path(__file__).resolve().parents[2] / 'Data' / 'tickers'
 
 # Create directory if it doesn't exist
 directory.mkdir(parents=True, exist_ok=True)
-
-with sync_playwright() as p:
-    # Launch browser
-    browser = p.chromium.launch(headless=False)
-    context = browser.new_context(accept_downloads=True)
-    page = context.new_page()
-
-    # Navigate to your website
-    page.goto("https://www.nasdaq.com/market-activity/stocks/screener?page=1&rows_per_page=25")
-
-    # Wait for the page to load
-    page.wait_for_load_state("networkidle")
-
-    # Handle cookie consent popup
-    try:
-        # Wait for the cookie banner -> click "I Accept"
-        accept_button = page.locator("#onetrust-accept-btn-handler")
-        if accept_button.is_visible():
-            print("Cookie consent popup found, clicking 'I Accept'...")
-            accept_button.click()
-    except:
-        print("No cookie consent popup found or already accepted")
-
-    # The download button selector
-    download_button_selector = "button.jupiter22-c-table__download-csv"
-
-    # Wait for the download button to be visible
-    page.wait_for_selector(download_button_selector, state="visible", timeout=1000)
-
-    # Start waiting for download before clicking
-    with page.expect_download() as download_info:
-        page.click(download_button_selector)
-
-    download = download_info.value
-
-    # Save to specific directory
-    download_path = directory / f"nasdaq_screener.csv"
-    download.save_as(str(download_path))
-    print(f"Downloaded to: {download_path}")
-
-    browser.close()
\ No newline at end of file
+download_path = directory / "nasdaq_screener.csv"
+
+# Same data the screener page's "Download CSV" button fetches
+url = "https://api.nasdaq.com/api/screener/stocks"
+params = {'tableonly': 'true', 'download': 'true'}
+headers = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'),
+    'Accept': 'application/json'
+}
+
+# Only download again if the list changed since our copy was saved
+if download_path.exists():
+    headers['If-Modified-Since'] = formatdate(download_path.stat().st_mtime, usegmt=True)
+
+response = requests.get(url, params=params, headers=headers, timeout=30)
+
+if response.status_code == 304:
+    print(f"Ticker list not modified, keeping: {download_path}")
+else:
+    response.raise_for_status()
+    data = response.json().get('data')
+
+    # A rejected or throttled call still answers 200, with "data": null
+    if not data or not data.get('rows'):
+        sys.exit(f"NASDAQ API returned no ticker rows, keeping: {download_path}")
+
+    # Column keys -> CSV headers, e.g. 'lastsale' -> 'Last Sale'
+    columns = data['headers']
+
+    # Write to a temp file first so a failed download never leaves a partial CSV
+    tmp_path = download_path.with_suffix('.csv.tmp')
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns), extrasaction='ignore')
+        writer.writerow(columns)
+        writer.writerows(data['rows'])
+    os.replace(tmp_path, download_path)
+    print(f"Downloaded {len(data['rows'])} tickers to: {download_path}")
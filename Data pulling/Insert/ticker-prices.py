@@ -8,33 +8,96 @@ Processes in chunks with user confirmation and avoids duplicate downloads.
 import sqlite3
 import yfinance as yf
 import pandas as pd
-from datetime import datetime, timedelta
-import time
+import asyncio
+import calendar
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, timedelta
+import queue
 import sys
+import time
+import atexit
 import logging
-from typing import List, Tuple, Optional, Dict
+import logging.handlers
+from typing import Any, List, Tuple, Optional, Dict
+from urllib.parse import quote
 import argparse
 from pathlib import Path
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ticker_prices_log.txt'),
-        logging.StreamHandler()
-    ]
-)
+# yfinance >= 0.2.54 only accepts curl_cffi sessions; older versions use requests
+try:
+    from curl_cffi import requests as http_requests
+    SESSION_KWARGS = {'impersonate': 'chrome'}
+except ImportError:
+    import requests as http_requests
+    SESSION_KWARGS = {}
+
+# Raised by yfinance >= 0.2.55 when Yahoo answers 429; older versions have none
+try:
+    from yfinance.exceptions import YFRateLimitError
+except ImportError:
+    class YFRateLimitError(Exception):
+        pass
+
+# Only needed for the --async-fetch download path
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# Setup logging. File records are queued and written by a background listener
+# thread, so file writes stay out of the download and insert loop. The console
+# handler stays synchronous so log lines keep their order relative to the
+# print() progress output and input() prompts.
+log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+file_handler = logging.FileHandler('ticker_prices_log.txt', encoding='utf-8')
+file_handler.setFormatter(log_formatter)
+console_handler = logging.StreamHandler()
+console_handler.setFormatter(log_formatter)
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+log_listener.start()
+# Flush any queued records before the interpreter exits
+atexit.register(log_listener.stop)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+logging.getLogger().addHandler(console_handler)
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Rows packed into one multi-row INSERT. Each row binds 8 parameters, and
+# SQLite before 3.32 caps a statement at 999 bound parameters (32766 after).
+ROWS_PER_INSERT = 500 if sqlite3.sqlite_version_info >= (3, 32, 0) else 999 // 8
+
+# Yahoo Finance chart endpoint used by the async download path
+CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+CHART_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                   '(KHTML, like Gecko) Chrome/124.0 Safari/537.36')
+}
+# Retries when Yahoo rate limits (or 5xx for the chart API), backing off
+# 1s, 2s, 4s, ... between attempts
+MAX_FETCH_RETRIES = 5
+
 
 class StockPriceUpdater:
     """Manages fetching and storing historical stock price data"""
     
-    def __init__(self, db_path: str = "../../StockData.db", chunk_size: int = 50):
+    def __init__(self, db_path: str = "../../StockData.db", chunk_size: int = 50,
+                 max_workers: int = 8, use_async: bool = False):
         """Initialize the updater with database connection"""
+        if use_async and aiohttp is None:
+            raise ImportError("aiohttp is required for async fetching (pip install aiohttp)")
         self.db_path = Path(db_path).resolve()
         self.chunk_size = chunk_size
+        self.max_workers = max_workers
+        self.use_async = use_async
+        # One HTTP session for every yf.Ticker, so connections are kept alive.
+        # yfinance holds a single process-wide session (and cookie/crumb) that
+        # all threads share; passing a different one per Ticker would replace
+        # it and invalidate the cached crumb.
+        self.session = http_requests.Session(**SESSION_KWARGS)
+        # Multi-row INSERT text for a full batch, built once and reused so
+        # sqlite3's statement cache compiles it a single time
+        self._insert_sql = self._staging_insert_sql(ROWS_PER_INSERT)
         self.conn = None
         self.cursor = None
         self.connect_db()
@@ -42,12 +105,42 @@ class StockPriceUpdater:
     def connect_db(self):
         """Establish database connection"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = sqlite3.connect(self.db_path, cached_statements=256)
             self.cursor = self.conn.cursor()
+            self._configure_pragmas()
+            self._create_staging_table()
             logger.info(f"Connected to database: {self.db_path}")
         except sqlite3.Error as e:
             logger.error(f"Failed to connect to database: {e}")
             raise
+
+    def _configure_pragmas(self):
+        """Tune SQLite for write throughput (WAL journal, relaxed fsync)"""
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")
+        self.cursor.execute("PRAGMA mmap_size=268435456")
+    
+    def _create_staging_table(self):
+        """
+        Create the connection-local table that price rows are staged in.
+        It has no UNIQUE constraint or indexes, so staging a ticker is a plain
+        append; flush_staged_prices later moves the rows in one sorted pass.
+        """
+        self.cursor.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS staging_prices
+            (
+                ticker_id INTEGER,
+                date      TEXT,
+                open      REAL,
+                high      REAL,
+                low       REAL,
+                close     REAL,
+                adj_close REAL,
+                volume    INTEGER
+            )
+        """)
             
     def get_all_tickers(self) -> List[Tuple[int, str, str]]:
         """Fetch all tickers from the database"""
@@ -59,120 +152,318 @@ class StockPriceUpdater:
         self.cursor.execute(query)
         return self.cursor.fetchall()
     
-    def get_latest_price_date(self, ticker_id: int) -> Optional[datetime]:
-        """Get the latest date we have price data for a ticker"""
+    def get_all_latest_dates(self) -> Dict[int, str]:
+        """Get the latest price date ('YYYY-MM-DD') for every ticker in a single query"""
         query = """
-            SELECT MAX(date) 
+            SELECT ticker_id, MAX(date) 
             FROM historic_prices 
-            WHERE ticker_id = ?
+            GROUP BY ticker_id
         """
-        self.cursor.execute(query, (ticker_id,))
-        result = self.cursor.fetchone()
+        self.cursor.execute(query)
+        return {
+            ticker_id: latest
+            for ticker_id, latest in self.cursor.fetchall()
+            if latest
+        }
+    
+    @staticmethod
+    def _next_fetch_day(symbol: str, start_date: str) -> Optional[date]:
+        """
+        Day to resume fetching from: the day after the latest stored date
         
-        if result and result[0]:
-            # Convert string date to datetime
-            return datetime.strptime(result[0], '%Y-%m-%d')
-        return None
+        Returns:
+            The next day, or None if the ticker is already up to date
+        """
+        next_day = date.fromisoformat(start_date) + timedelta(days=1)
+        # Don't fetch if we're already up to date (next_day is in the future)
+        if next_day > date.today():
+            logger.info(f"  {symbol}: Already up to date")
+            return None
+        return next_day
     
-    def fetch_historical_data(self, symbol: str, start_date: Optional[datetime] = None) -> pd.DataFrame:
+    def fetch_historical_data(self, symbol: str, start_date: Optional[str] = None) -> pd.DataFrame:
         """
         Fetch historical data for a symbol from Yahoo Finance
         
         Args:
             symbol: Stock ticker symbol
-            start_date: Start date for data fetch. If None, fetches all available history
+            start_date: Latest date already stored ('YYYY-MM-DD'); data is fetched
+                from the following day. If None, fetches all available history
             
         Returns:
             DataFrame with historical price data
-        """
-        try:
-            ticker = yf.Ticker(symbol)
             
-            # If we have existing data, fetch from the next day
-            if start_date:
-                start_date = start_date + timedelta(days=1)
-                # Don't fetch if we're already up to date (start_date is in the future)
-                if start_date >= datetime.now():
-                    logger.info(f"  {symbol}: Already up to date")
-                    return pd.DataFrame()
-                    
-                df = ticker.history(start=start_date, auto_adjust=False)
-            else:
-                # Fetch all available history
-                df = ticker.history(period="max", auto_adjust=False)
-            
-            if df.empty:
-                logger.warning(f"  {symbol}: No data available")
-                return df
+        Raises:
+            Any download error (after retrying rate limits), so the caller
+            records the ticker as failed rather than as having no data
+        """
+        ticker = yf.Ticker(symbol, session=self.session)
+        
+        # If we have existing data, fetch from the next day
+        if start_date:
+            next_day = self._next_fetch_day(symbol, start_date)
+            if next_day is None:
+                return pd.DataFrame()
                 
-            # Reset index to make date a column
-            df.reset_index(inplace=True)
-            
-            # Rename columns to match our database schema
-            df.rename(columns={
-                'Date': 'date',
-                'Open': 'open',
-                'High': 'high',
-                'Low': 'low',
-                'Close': 'close',
-                'Adj Close': 'adj_close',
-                'Volume': 'volume'
-            }, inplace=True)
-            
-            # Remove timezone info if present
-            if pd.api.types.is_datetime64_any_dtype(df['date']):
-                df['date'] = df['date'].dt.tz_localize(None)
-            
+            history_kwargs = {'start': next_day.isoformat()}
+        else:
+            # Fetch all available history
+            history_kwargs = {'period': 'max'}
+        
+        for attempt in range(MAX_FETCH_RETRIES + 1):
+            try:
+                df = ticker.history(auto_adjust=False, **history_kwargs)
+                break
+            except YFRateLimitError:
+                if attempt == MAX_FETCH_RETRIES:
+                    raise
+                delay = 2 ** attempt
+                logger.warning(f"  {symbol}: Rate limited, retrying in {delay}s")
+                time.sleep(delay)
+        
+        if df.empty:
+            logger.warning(f"  {symbol}: No data available")
             return df
             
-        except Exception as e:
-            logger.error(f"  {symbol}: Error fetching data - {e}")
+        # Reset index to make date a column
+        df.reset_index(inplace=True)
+        
+        # Rename columns to match our database schema
+        df.rename(columns={
+            'Date': 'date',
+            'Open': 'open',
+            'High': 'high',
+            'Low': 'low',
+            'Close': 'close',
+            'Adj Close': 'adj_close',
+            'Volume': 'volume'
+        }, inplace=True)
+        
+        # Remove timezone info if present
+        if pd.api.types.is_datetime64_any_dtype(df['date']):
+            df['date'] = df['date'].dt.tz_localize(None)
+        
+        return df
+    
+    async def fetch_chunk_async(self, tickers: List[Tuple[int, str, str]],
+                                latest_dates: Dict[int, str]) -> Dict[int, pd.DataFrame]:
+        """
+        Fetch historical data for a whole chunk concurrently from Yahoo's chart
+        API with aiohttp, bypassing yfinance
+        
+        Args:
+            tickers: Tickers in the chunk
+            latest_dates: Latest stored price date per ticker_id
+            
+        Returns:
+            DataFrame per ticker_id, in the same format as fetch_historical_data,
+            or the exception raised while downloading that ticker
+        """
+        semaphore = asyncio.Semaphore(self.max_workers)
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_workers)
+        timeout = aiohttp.ClientTimeout(total=60)
+        async with aiohttp.ClientSession(connector=connector, headers=CHART_HEADERS,
+                                         timeout=timeout) as session:
+            frames = await asyncio.gather(*(
+                self._fetch_chart(session, semaphore, symbol, latest_dates.get(ticker_id))
+                for ticker_id, symbol, _ in tickers
+            ), return_exceptions=True)
+        return {ticker_id: df for (ticker_id, _, _), df in zip(tickers, frames)}
+    
+    async def _fetch_chart(self, session, semaphore: asyncio.Semaphore, symbol: str,
+                           start_date: Optional[str] = None) -> pd.DataFrame:
+        """Async counterpart of fetch_historical_data for a single symbol"""
+        period2 = int(time.time())
+        
+        # If we have existing data, fetch from the next day
+        if start_date:
+            next_day = self._next_fetch_day(symbol, start_date)
+            if next_day is None:
+                return pd.DataFrame()
+            period1 = calendar.timegm(next_day.timetuple())
+        else:
+            # Fetch all available history. Like yfinance's period="max", ask for
+            # an explicit 99-year window: with range=max Yahoo coarsens the bars
+            period1 = period2 - 99 * 365 * 24 * 60 * 60
+        
+        params = {
+            'period1': period1,
+            'period2': period2,
+            'interval': '1d',
+            'events': 'div,splits',
+            'includeAdjustedClose': 'true'
+        }
+        
+        async with semaphore:
+            payload = await self._get_chart_json(session, CHART_URL.format(symbol=quote(symbol)), params)
+        
+        df = self._parse_chart(payload) if payload else pd.DataFrame()
+        if df.empty:
+            logger.warning(f"  {symbol}: No data available")
+        return df
+    
+    async def _get_chart_json(self, session, url: str, params: Dict) -> Optional[Dict[str, Any]]:
+        """
+        GET a chart URL, retrying with exponential backoff when rate limited
+        
+        Returns:
+            Decoded JSON payload, or None if Yahoo has no such symbol
+        """
+        for attempt in range(MAX_FETCH_RETRIES + 1):
+            async with session.get(url, params=params) as response:
+                if response.status == 404:
+                    return None
+                if response.status != 429 and response.status < 500:
+                    response.raise_for_status()
+                    return await response.json()
+                if attempt == MAX_FETCH_RETRIES:
+                    response.raise_for_status()
+                # Honour Retry-After when Yahoo sends one
+                retry_after = response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else 2 ** attempt
+            await asyncio.sleep(delay)
+    
+    @staticmethod
+    def _parse_chart(payload: Dict[str, Any]) -> pd.DataFrame:
+        """Convert a chart API payload into the fetch_historical_data format"""
+        result = (payload.get('chart', {}).get('result') or [None])[0]
+        if not result or not result.get('timestamp'):
             return pd.DataFrame()
+        
+        # Never store anything but daily bars in historic_prices
+        granularity = result.get('meta', {}).get('dataGranularity')
+        if granularity != '1d':
+            raise ValueError(f"Expected daily bars, got granularity {granularity!r}")
+        
+        indicators = result['indicators']
+        prices = indicators['quote'][0]
+        adj_close = (indicators.get('adjclose') or [{}])[0].get('adjclose', prices['close'])
+        # Bar timestamps are UTC; shift to exchange time before taking the date
+        offset = result.get('meta', {}).get('gmtoffset') or 0
+        
+        return pd.DataFrame({
+            'date': pd.to_datetime([ts + offset for ts in result['timestamp']], unit='s').normalize(),
+            'open': prices['open'],
+            'high': prices['high'],
+            'low': prices['low'],
+            'close': prices['close'],
+            'adj_close': adj_close,
+            'volume': prices['volume']
+        })
+    
+    @staticmethod
+    def _staging_insert_sql(rows: int) -> str:
+        """Build an INSERT into staging_prices with placeholders for the given number of rows"""
+        placeholders = ', '.join(['(?, ?, ?, ?, ?, ?, ?, ?)'] * rows)
+        return f"""
+            INSERT INTO staging_prices 
+            (ticker_id, date, open, high, low, close, adj_close, volume)
+            VALUES {placeholders}
+        """
     
     def insert_price_data(self, ticker_id: int, df: pd.DataFrame) -> int:
         """
-        Insert price data into the database
+        Stage price data for insertion into the database. The rows reach
+        historic_prices when flush_staged_prices is called
         
         Returns:
-            Number of rows inserted
+            Number of rows staged
         """
         if df.empty:
             return 0
             
         try:
-            # Prepare data for insertion
-            data_to_insert = []
-            for _, row in df.iterrows():
-                data_to_insert.append((
-                    ticker_id,
-                    row['date'].strftime('%Y-%m-%d') if pd.notna(row['date']) else None,
-                    row['open'] if pd.notna(row['open']) else None,
-                    row['high'] if pd.notna(row['high']) else None,
-                    row['low'] if pd.notna(row['low']) else None,
-                    row['close'] if pd.notna(row['close']) else None,
-                    row['adj_close'] if pd.notna(row['adj_close']) else None,
-                    int(row['volume']) if pd.notna(row['volume']) else None
-                ))
+            # Prepare data for insertion (vectorized instead of iterating rows)
+            df = df[['date', 'open', 'high', 'low', 'close', 'adj_close', 'volume']].copy()
+            df['date'] = df['date'].dt.strftime('%Y-%m-%d')
+            df['volume'] = df['volume'].astype('Int64')
+            # Cast to object first so missing values become None, not NaN/<NA>
+            df = df.astype(object).where(df.notna(), None)
+            df.insert(0, 'ticker_id', ticker_id)
+            # 2-D object array; each batch's bind parameters are a C-level ravel
+            data_to_insert = df.to_numpy(dtype=object)
+            
+            # Savepoint so a failed ticker only undoes its own rows; the
+            # surrounding chunk transaction is committed by process_chunk
+            self.cursor.execute("SAVEPOINT insert_prices")
             
-            # Batch insert with IGNORE to skip any duplicates
-            self.cursor.executemany("""
-                INSERT OR IGNORE INTO historic_prices 
-                (ticker_id, date, open, high, low, close, adj_close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, data_to_insert)
+            # Batch insert, many rows per statement so SQLite binds and steps
+            # once per batch, not per row (duplicates are skipped on flush)
+            for start in range(0, len(data_to_insert), ROWS_PER_INSERT):
+                batch = data_to_insert[start:start + ROWS_PER_INSERT]
+                if len(batch) == ROWS_PER_INSERT:
+                    sql = self._insert_sql
+                else:
+                    sql = self._staging_insert_sql(len(batch))
+                self.cursor.execute(sql, batch.ravel().tolist())
             
-            self.conn.commit()
-            rows_inserted = self.cursor.rowcount
+            self.cursor.execute("RELEASE SAVEPOINT insert_prices")
             return len(data_to_insert)  # Return actual number of rows we tried to insert
             
         except sqlite3.Error as e:
             logger.error(f"Database error during insertion: {e}")
-            self.conn.rollback()
+            if self.conn.in_transaction:
+                self.cursor.execute("ROLLBACK TO SAVEPOINT insert_prices")
+                self.cursor.execute("RELEASE SAVEPOINT insert_prices")
             return 0
     
-    def process_ticker(self, ticker_id: int, symbol: str, company_name: str, dry_run: bool = False) -> Dict:
+    def flush_staged_prices(self) -> int:
         """
-        Process a single ticker: check existing data, fetch new data, and store it
+        Move all staged rows into historic_prices with a single INSERT ... SELECT.
+        Rows are ordered by (ticker_id, date) so the UNIQUE index is filled
+        sequentially instead of by random B-tree inserts
+        
+        Returns:
+            Number of new rows written to historic_prices
+        """
+        # IGNORE to skip any duplicates of rows already stored
+        self.cursor.execute("""
+            INSERT OR IGNORE INTO historic_prices 
+            (ticker_id, date, open, high, low, close, adj_close, volume)
+            SELECT ticker_id, date, open, high, low, close, adj_close, volume
+            FROM staging_prices
+            ORDER BY ticker_id, date
+        """)
+        rows_added = self.cursor.rowcount
+        self.cursor.execute("DELETE FROM staging_prices")
+        return rows_added
+    
+    def drop_date_index(self):
+        """Drop the secondary date index ahead of a cold bulk load"""
+        self.cursor.execute("DROP INDEX IF EXISTS idx_historic_prices_date")
+        logger.info("Dropped idx_historic_prices_date for bulk load")
+    
+    def ensure_date_index(self):
+        """
+        Create the date index (same definition as createdb.py) if it is missing,
+        in one sorted build. Used after a bulk load, and at the start of other
+        runs to heal a bulk load that died before it could rebuild the index
+        """
+        self.cursor.execute("""
+            SELECT 1
+            FROM sqlite_master
+            WHERE type = 'index' AND name = 'idx_historic_prices_date'
+        """)
+        if self.cursor.fetchone():
+            return
+        
+        self.cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_historic_prices_date
+                ON historic_prices (date)
+        """)
+        self.conn.commit()
+        logger.info("Built idx_historic_prices_date")
+    
+    def process_ticker(self, ticker_id: int, symbol: str, company_name: str,
+                       latest_date: Optional[str], pending_fetch: Optional[Future] = None,
+                       dry_run: bool = False) -> Dict:
+        """
+        Process a single ticker: report existing data, fetch new data, and store it
+        
+        Args:
+            latest_date: Latest date already stored for the ticker (None if no data)
+            pending_fetch: Future of a fetch_historical_data call already submitted
+                to a worker thread. If None, the data is fetched synchronously
         
         Returns:
             Dictionary with processing results
@@ -180,16 +471,13 @@ class StockPriceUpdater:
         result = {
             'symbol': symbol,
             'success': False,
-            'rows_added': 0,
+            'rows_staged': 0,
             'error': None
         }
         
         try:
-            # Check what data we already have
-            latest_date = self.get_latest_price_date(ticker_id)
-            
             if latest_date:
-                logger.info(f"  {symbol}: Last data from {latest_date.strftime('%Y-%m-%d')}")
+                logger.info(f"  {symbol}: Last data from {latest_date}")
             else:
                 logger.info(f"  {symbol}: No existing data, fetching full history")
             
@@ -198,17 +486,25 @@ class StockPriceUpdater:
                 result['dry_run'] = True
                 return result
             
-            # Fetch new data
-            df = self.fetch_historical_data(symbol, latest_date)
+            # Fetch new data (or wait for the fetch already running in the pool)
+            try:
+                if pending_fetch is not None:
+                    df = pending_fetch.result()
+                else:
+                    df = self.fetch_historical_data(symbol, latest_date)
+            except Exception as e:
+                result['error'] = str(e)
+                logger.error(f"  {symbol}: Error fetching data - {e}")
+                return result
             
             if not df.empty:
-                # Insert the data
-                rows_added = self.insert_price_data(ticker_id, df)
-                result['rows_added'] = rows_added
+                # Stage the data; duplicates of stored rows are dropped at flush
+                rows_staged = self.insert_price_data(ticker_id, df)
+                result['rows_staged'] = rows_staged
                 result['success'] = True
                 
-                if rows_added > 0:
-                    logger.info(f"  {symbol}: Added {rows_added} new price records")
+                if rows_staged > 0:
+                    logger.info(f"  {symbol}: Staged {rows_staged} price records")
                 else:
                     logger.info(f"  {symbol}: No new data to add")
             else:
@@ -221,10 +517,15 @@ class StockPriceUpdater:
         return result
     
     def process_chunk(self, tickers: List[Tuple[int, str, str]], chunk_num: int, 
-                     total_chunks: int, dry_run: bool = False) -> Dict:
+                     total_chunks: int, latest_dates: Dict[int, str],
+                     dry_run: bool = False) -> Dict:
         """
         Process a chunk of tickers
         
+        Args:
+            latest_dates: Latest stored price date per ticker_id, as returned
+                by get_all_latest_dates. Tickers without data are absent
+        
         Returns:
             Dictionary with chunk processing results
         """
@@ -246,23 +547,60 @@ class StockPriceUpdater:
         if dry_run:
             print("\n= DRY RUN MODE - No data will be downloaded")
         
-        # Process each ticker with a small delay to avoid rate limiting
-        for i, (ticker_id, symbol, company_name) in enumerate(tickers, 1):
-            print(f"\n[{i}/{len(tickers)}] Processing {symbol} - {company_name[:40]}...")
-            
-            result = self.process_ticker(ticker_id, symbol, company_name, dry_run)
-            chunk_results['ticker_results'].append(result)
-            chunk_results['processed'] += 1
-            
-            if result['success']:
-                chunk_results['successful'] += 1
-                chunk_results['rows_added'] += result.get('rows_added', 0)
-            else:
-                chunk_results['failed'] += 1
+        # Downloads are network-bound, so run them concurrently in worker threads
+        # (or on an event loop with --async-fetch). The sqlite connection is not
+        # shared with the downloads: results are inserted serially on this thread,
+        # in chunk order.
+        executor = None
+        pending = {}
+        if not dry_run and self.use_async:
+            # The whole chunk is downloaded before inserting starts
+            frames = asyncio.run(self.fetch_chunk_async(tickers, latest_dates))
+            for ticker_id, df in frames.items():
+                pending[ticker_id] = Future()
+                if isinstance(df, BaseException):
+                    pending[ticker_id].set_exception(df)
+                else:
+                    pending[ticker_id].set_result(df)
+        elif not dry_run:
+            executor = ThreadPoolExecutor(max_workers=self.max_workers)
+            pending = {
+                ticker_id: executor.submit(self.fetch_historical_data, symbol, latest_dates.get(ticker_id))
+                for ticker_id, symbol, _ in tickers
+            }
+        
+        # Insert the whole chunk under one transaction (one commit per chunk).
+        # A dry run only reports, so it never opens a write transaction.
+        if not dry_run:
+            self.cursor.execute("BEGIN")
+        try:
+            for i, (ticker_id, symbol, company_name) in enumerate(tickers, 1):
+                print(f"\n[{i}/{len(tickers)}] Processing {symbol} - {company_name[:40]}...")
+                
+                result = self.process_ticker(ticker_id, symbol, company_name,
+                                             latest_dates.get(ticker_id), pending.get(ticker_id),
+                                             dry_run)
+                chunk_results['ticker_results'].append(result)
+                chunk_results['processed'] += 1
+                
+                if result['success']:
+                    chunk_results['successful'] += 1
+                else:
+                    chunk_results['failed'] += 1
             
-            # Small delay between requests to be respectful to Yahoo Finance
-            if not dry_run and i < len(tickers):
-                time.sleep(0.5)
+            if not dry_run:
+                # Count only rows that were actually new, not everything staged
+                chunk_results['rows_added'] = self.flush_staged_prices()
+                logger.info(f"Chunk {chunk_num}: Wrote {chunk_results['rows_added']} new rows to historic_prices")
+                self.conn.commit()
+        except BaseException:
+            if not dry_run:
+                logger.error(f"Chunk {chunk_num} aborted, rolling back its inserts")
+                self.conn.rollback()
+            raise
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
         
         return chunk_results
     
@@ -274,6 +612,7 @@ class StockPriceUpdater:
             specific_tickers: List of specific ticker symbols to process (optional)
             dry_run: If True, only show what would be done without fetching data
         """
+        bulk_load = False
         try:
             # Get tickers to process
             all_tickers = self.get_all_tickers()
@@ -297,6 +636,17 @@ class StockPriceUpdater:
                      for i in range(0, total_tickers, self.chunk_size)]
             total_chunks = len(chunks)
             
+            # Look up what data we already have for every ticker up front
+            latest_dates = self.get_all_latest_dates()
+            
+            # On a cold load (no prices stored yet) build the date index once at
+            # the end rather than updating it for every inserted row
+            bulk_load = not dry_run and not latest_dates
+            if bulk_load:
+                self.drop_date_index()
+            elif not dry_run:
+                self.ensure_date_index()
+            
             print(f"= Will process in {total_chunks} chunks of up to {self.chunk_size} tickers each")
             
             # Process statistics
@@ -319,7 +669,7 @@ class StockPriceUpdater:
                         continue
                 
                 # Process the chunk
-                chunk_results = self.process_chunk(chunk, chunk_num, total_chunks, dry_run)
+                chunk_results = self.process_chunk(chunk, chunk_num, total_chunks, latest_dates, dry_run)
                 
                 # Update totals
                 total_processed += chunk_results['processed']
@@ -355,15 +705,26 @@ class StockPriceUpdater:
             logger.error(f"Unexpected error in main execution: {e}")
             raise
         finally:
+            if bulk_load:
+                self.ensure_date_index()
             self.close()
     
     def close(self):
-        """Close database connection"""
+        """Close HTTP session and database connection"""
+        self.session.close()
         if self.conn:
             self.conn.close()
             logger.info("Database connection closed")
 
 
+def positive_int(value: str) -> int:
+    """argparse type for options that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
 def main():
     """Main entry point with command-line interface"""
     parser = argparse.ArgumentParser(
@@ -375,6 +736,17 @@ def main():
         default=50,
         help='Number of tickers to process in each chunk (default: 50)'
     )
+    parser.add_argument(
+        '--workers',
+        type=positive_int,
+        default=8,
+        help='Number of concurrent downloads (default: 8)'
+    )
+    parser.add_argument(
+        '--async-fetch',
+        action='store_true',
+        help='Download with aiohttp straight from the Yahoo chart API instead of yfinance'
+    )
     parser.add_argument(
         '--tickers',
         nargs='+',
@@ -398,6 +770,7 @@ def main():
     print("="*60)
     print(f"Database: {Path(args.db_path).resolve()}")
     print(f"Chunk size: {args.chunk_size}")
+    print(f"Concurrent downloads: {args.workers}" + (" (async)" if args.async_fetch else ""))
     if args.tickers:
         print(f"Specific tickers: {', '.join(args.tickers)}")
     if args.dry_run:
@@ -405,7 +778,8 @@ def main():
     print("="*60)
     
     # Create and run the updater
-    updater = StockPriceUpdater(db_path=args.db_path, chunk_size=args.chunk_size)
+    updater = StockPriceUpdater(db_path=args.db_path, chunk_size=args.chunk_size,
+                                max_workers=args.workers, use_async=args.async_fetch)
     updater.run(specific_tickers=args.tickers, dry_run=args.dry_run)
 
 
@@ -16,6 +16,15 @@ class StockDataDB:
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
         self.cursor = self.conn.cursor()
+        self._configure_pragmas()
+
+    def _configure_pragmas(self):
+        """Tune SQLite for write throughput (WAL journal, relaxed fsync)"""
+        self.cursor.execute("PRAGMA journal_mode=WAL")
+        self.cursor.execute("PRAGMA synchronous=NORMAL")
+        self.cursor.execute("PRAGMA temp_store=MEMORY")
+        self.cursor.execute("PRAGMA cache_size=-65536")
+        self.cursor.execute("PRAGMA mmap_size=268435456")
 
     def create_tables(self):
         """Create all necessary tables for forward data"""
@@ -33,18 +42,6 @@ class StockDataDB:
                             )
                             ''')
 
-        self.cursor.execute('''
-                            CREATE TABLE IF NOT EXISTS Key_Data
-                            (
-                                ticker_id    INTEGER PRIMARY KEY AUTOINCREMENT,
-                                symbol       TEXT UNIQUE NOT NULL,
-                                company_name TEXT,
-                                sector       TEXT,
-                                industry     TEXT,
-                                last_updated TIMESTAMP
-                            )
-                            ''')
-
         # Historic prices table (normalized structure)
         self.cursor.execute('''
                             CREATE TABLE IF NOT EXISTS historic_prices
@@ -70,10 +67,10 @@ class StockDataDB:
                                 ON historic_prices (date)
                             ''')
 
-        self.cursor.execute('''
-                            CREATE INDEX IF NOT EXISTS idx_historic_prices_ticker
-                                ON historic_prices (ticker_id)
-                            ''')
+        # No separate ticker_id index: the UNIQUE (ticker_id, date) constraint
+        # already creates a composite index that serves ticker lookups and
+        # MAX(date) per ticker. Drop the old redundant one on existing databases.
+        self.cursor.execute('DROP INDEX IF EXISTS idx_historic_prices_ticker')
 
         self.conn.commit()
         print("✅ Database tables created successfully")
@@ -104,7 +101,6 @@ class StockDataDB:
 
         print("\nTable Descriptions:")
         print("  • tickers: Stores basic ticker information")
-        print("  • Key_Data: Alternative ticker information table")
         print("  • historic_prices: Stores daily price data for all tickers")
 
         print("=" * 60)
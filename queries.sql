@@ -18,6 +18,7 @@ DROP TABLE IF EXISTS revenue_estimates;
 DROP TABLE IF EXISTS earnings_estimates;
 DROP TABLE IF EXISTS analyst_recommendations;
 DROP TABLE IF EXISTS forward_estimates;
+DROP TABLE IF EXISTS Key_Data;
 DROP TABLE IF EXISTS tickers;
 
 